@@ -0,0 +1,393 @@
+import itertools
+import numpy as np
+from time import time
+from typing import Callable, Iterable, List, Optional, Tuple
+
+
+# (row, column) steps to the eight cells surrounding a seat
+ADJACENT_DIRECTIONS: List[Tuple[int, int]] = [
+    (di, dj)
+    for di, dj in itertools.product([-1, 0, 1], repeat=2)
+    if (di, dj) != (0, 0)
+]
+
+
+class Neighbourhood:
+    """
+    Which seats count as neighbours of a seat.
+
+    From each seat, every direction is followed one step at a time until it
+    meets a seat, for at most `max_distance` steps (None means until the edge
+    of the grid). The seat met, if any, is a neighbour.
+    """
+
+    def __init__(
+        self,
+        directions: Iterable[Tuple[int, int]] = ADJACENT_DIRECTIONS,
+        max_distance: Optional[int] = 1,
+    ):
+        self.directions = [(int(di), int(dj)) for di, dj in directions]
+        if not self.directions or (0, 0) in self.directions:
+            raise ValueError(f"Invalid directions: {self.directions}")
+        if max_distance is not None and max_distance < 1:
+            raise ValueError(f"Invalid max distance: {max_distance}")
+        self.max_distance = max_distance
+
+    @classmethod
+    def adjacent(cls) -> "Neighbourhood":
+        return cls(ADJACENT_DIRECTIONS, max_distance=1)
+
+    @classmethod
+    def line_of_sight(
+        cls,
+        directions: Iterable[Tuple[int, int]] = ADJACENT_DIRECTIONS,
+        max_distance: Optional[int] = None,
+    ) -> "Neighbourhood":
+        return cls(directions, max_distance)
+
+    @classmethod
+    def radius(cls, radius: int) -> "Neighbourhood":
+        # every cell within Chebyshev distance `radius`, as single steps
+        offsets = range(-radius, radius + 1)
+        return cls(
+            [(di, dj) for di, dj in itertools.product(offsets, repeat=2) if di or dj],
+            max_distance=1,
+        )
+
+    def compile(self, seats: np.ndarray) -> "CompiledNeighbourhood":
+        return CompiledNeighbourhood(seats, self)
+
+
+class CompiledNeighbourhood:
+    """
+    Neighbour structure of one layout, computed once for every round.
+
+    Seats are numbered in row-major order; `neighbours[s]` lists the seat
+    numbers of seat `s`'s neighbours, padded with `seat_count`, which indexes
+    an always-vacant sentinel at the end of the occupancy vector.
+    """
+
+    def __init__(self, seats: np.ndarray, neighbourhood: Neighbourhood):
+        self.shape = seats.shape
+        self.neighbourhood = neighbourhood
+        self.seat_rows, self.seat_cols = np.nonzero(seats)
+        self.seat_count = len(self.seat_rows)
+        seat_index = np.full(seats.shape, -1, dtype=np.int64)
+        seat_index[self.seat_rows, self.seat_cols] = np.arange(self.seat_count)
+        neighbours = np.stack(
+            [
+                first_seat_along(seat_index, di, dj, neighbourhood.max_distance)[
+                    self.seat_rows, self.seat_cols
+                ]
+                for di, dj in neighbourhood.directions
+            ],
+            axis=1,
+        )
+        # move real neighbours to the front of each row and trim the padding
+        neighbours[neighbours < 0] = self.seat_count
+        neighbours.sort(axis=1)
+        widths = np.count_nonzero(neighbours < self.seat_count, axis=0)
+        self.neighbours = neighbours[:, : np.count_nonzero(widths)]
+        self.neighbour_counts = np.count_nonzero(
+            self.neighbours < self.seat_count, axis=1
+        )
+
+    @property
+    def width(self) -> int:
+        return self.neighbours.shape[1]
+
+    def occupied_counts(self, occupied: np.ndarray) -> np.ndarray:
+        """
+        Occupied neighbour count per seat, given `seat_count + 1` occupancies.
+        """
+        return occupied[self.neighbours].sum(axis=1, dtype=np.int64)
+
+
+def first_seat_along(
+    seat_index: np.ndarray, di: int, dj: int, max_distance: Optional[int]
+) -> np.ndarray:
+    """
+    Index of the first seat met stepping by (di, dj) from each cell, or -1.
+
+    Sweeps rows (or columns) starting from the edge the steps lead towards,
+    so each line reuses the result for the cells it steps onto.
+    """
+    rows, cols = seat_index.shape
+    first_seat = np.full(seat_index.shape, -1, dtype=np.int64)
+    distance = np.zeros(seat_index.shape, dtype=np.int64)
+    if di != 0:
+        order = range(rows - 1, -1, -1) if di > 0 else range(rows)
+        j = np.arange(cols)
+        for i in order:
+            ni = i + di
+            if not 0 <= ni < rows:
+                continue
+            nj = j + dj
+            valid = (nj >= 0) & (nj < cols)
+            source, target = j[valid], nj[valid]
+            step_seat = seat_index[ni, target]
+            found = np.where(step_seat >= 0, step_seat, first_seat[ni, target])
+            steps = np.where(step_seat >= 0, 1, distance[ni, target] + 1)
+            if max_distance is not None:
+                found = np.where(steps <= max_distance, found, -1)
+            first_seat[i, source] = found
+            distance[i, source] = steps
+    else:
+        order = range(cols - 1, -1, -1) if dj > 0 else range(cols)
+        for j in order:
+            nj = j + dj
+            if not 0 <= nj < cols:
+                continue
+            step_seat = seat_index[:, nj]
+            found = np.where(step_seat >= 0, step_seat, first_seat[:, nj])
+            steps = np.where(step_seat >= 0, 1, distance[:, nj] + 1)
+            if max_distance is not None:
+                found = np.where(steps <= max_distance, found, -1)
+            first_seat[:, j] = found
+            distance[:, j] = steps
+    return first_seat
+
+
+class GatherStrategy:
+    """
+    Count neighbours by gathering the whole padded neighbour matrix at once.
+    """
+
+    name = "gather"
+
+    def __init__(
+        self, compiled: CompiledNeighbourhood, chunk_size: Optional[int] = None
+    ):
+        self.compiled = compiled
+
+    @classmethod
+    def applicable(cls, compiled: CompiledNeighbourhood) -> bool:
+        return True
+
+    def occupied_counts(self, occupied: np.ndarray) -> np.ndarray:
+        return self.compiled.occupied_counts(occupied)
+
+
+class ChunkedGatherStrategy(GatherStrategy):
+    """
+    Gather `chunk_size` seats at a time, bounding the temporary arrays.
+    """
+
+    name = "chunked_gather"
+    default_chunk_size = 65536
+
+    def __init__(
+        self, compiled: CompiledNeighbourhood, chunk_size: Optional[int] = None
+    ):
+        super().__init__(compiled)
+        self.chunk_size = chunk_size or self.default_chunk_size
+        self.counts = np.zeros(compiled.seat_count, dtype=np.int64)
+
+    def occupied_counts(self, occupied: np.ndarray) -> np.ndarray:
+        neighbours = self.compiled.neighbours
+        for start in range(0, self.compiled.seat_count, self.chunk_size):
+            end = start + self.chunk_size
+            occupied[neighbours[start:end]].sum(
+                axis=1, dtype=np.int64, out=self.counts[start:end]
+            )
+        return self.counts.copy()
+
+
+class BincountStrategy(GatherStrategy):
+    """
+    Count over an edge list without padding, for ragged neighbour counts.
+    """
+
+    name = "bincount"
+
+    def __init__(
+        self, compiled: CompiledNeighbourhood, chunk_size: Optional[int] = None
+    ):
+        super().__init__(compiled)
+        is_edge = compiled.neighbours < compiled.seat_count
+        self.sources = np.nonzero(is_edge)[0]
+        self.targets = compiled.neighbours[is_edge]
+
+    def occupied_counts(self, occupied: np.ndarray) -> np.ndarray:
+        return np.bincount(
+            self.sources[occupied[self.targets]], minlength=self.compiled.seat_count
+        )
+
+
+class StencilStrategy(GatherStrategy):
+    """
+    Sum shifted views of a dense occupancy grid; fixed offsets only.
+    """
+
+    name = "stencil"
+
+    def __init__(
+        self, compiled: CompiledNeighbourhood, chunk_size: Optional[int] = None
+    ):
+        if not self.applicable(compiled):
+            raise ValueError("Stencil strategy needs fixed offsets")
+        super().__init__(compiled)
+        directions = compiled.neighbourhood.directions
+        self.pad = max(max(abs(di), abs(dj)) for di, dj in directions)
+        rows, cols = compiled.shape
+        self.dense = np.zeros(
+            (rows + 2 * self.pad, cols + 2 * self.pad), dtype=np.int8
+        )
+        self.windows = [
+            (
+                slice(self.pad + di, self.pad + di + rows),
+                slice(self.pad + dj, self.pad + dj + cols),
+            )
+            for di, dj in directions
+        ]
+        # narrowest counts that cannot overflow, to keep the sums cache friendly
+        self.count_dtype = np.int8 if len(directions) <= 127 else np.int32
+        self.seat_rows = compiled.seat_rows + self.pad
+        self.seat_cols = compiled.seat_cols + self.pad
+
+    @classmethod
+    def applicable(cls, compiled: CompiledNeighbourhood) -> bool:
+        return compiled.neighbourhood.max_distance == 1
+
+    def occupied_counts(self, occupied: np.ndarray) -> np.ndarray:
+        self.dense[self.seat_rows, self.seat_cols] = occupied[:-1]
+        counts = np.zeros(self.compiled.shape, dtype=self.count_dtype)
+        for window in self.windows:
+            counts += self.dense[window]
+        return counts[self.seat_rows - self.pad, self.seat_cols - self.pad]
+
+
+STRATEGIES = {
+    strategy.name: strategy
+    for strategy in [
+        GatherStrategy,
+        ChunkedGatherStrategy,
+        BincountStrategy,
+        StencilStrategy,
+    ]
+}
+
+
+class RuleSeatLayout:
+    """
+    Seat layout evolved by a neighbourhood and birth/death thresholds.
+
+    A vacant seat becomes occupied when at most `birth_threshold` of its
+    neighbours are occupied; an occupied seat is vacated when at least
+    `death_threshold` are. Subclasses configure the rule as class attributes.
+
+    When no strategy is passed, `strategy_selector(compiled, calibrate=...)`
+    picks one, returning an object with `strategy` and `chunk_size`; without a
+    selector the plain gather strategy is used.
+    """
+
+    neighbourhood: Neighbourhood = Neighbourhood.adjacent()
+    birth_threshold: int = 0
+    death_threshold: int = 4
+    strategy_selector: Optional[Callable] = None
+
+    def __init__(
+        self,
+        initial_layout: str,
+        strategy: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        calibrate: bool = False,
+    ):
+        self.grid = np.array([list(line) for line in initial_layout.split("\n")])
+        self.xmin = 0
+        self.xmax = self.grid.shape[0] - 1
+        self.ymin = 0
+        self.ymax = self.grid.shape[1] - 1
+        self.compiled = self.neighbourhood.compile(self.grid != ".")
+        # one trailing slot for the always-vacant padding neighbour
+        self.occupied = np.zeros(self.compiled.seat_count + 1, dtype=bool)
+        self.occupied[:-1] = (
+            self.grid[self.compiled.seat_rows, self.compiled.seat_cols] == "#"
+        )
+        if strategy is None and self.strategy_selector is not None:
+            choice = self.strategy_selector(self.compiled, calibrate=calibrate)
+            strategy, chunk_size = choice.strategy, choice.chunk_size
+        elif strategy is None:
+            strategy = GatherStrategy.name
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Invalid strategy: {strategy}")
+        self.strategy = STRATEGIES[strategy](self.compiled, chunk_size)
+
+    def apply_until_convergence(self, verbose: bool = True) -> int:
+        start_time = time()
+        new_occupied = self.evolve_occupied(self.occupied)
+        round_count: int = 0
+        while not np.array_equal(new_occupied, self.occupied):
+            round_count += 1
+            self.occupied = new_occupied
+            new_occupied = self.evolve_occupied(self.occupied)
+        self.update_grid()
+        end_time = time()
+        if verbose:
+            print(
+                f"Grid converged after {round_count} rounds in {end_time - start_time:.2f} seconds"
+            )
+        return round_count
+
+    def apply_round(self):
+        self.occupied = self.evolve_occupied(self.occupied)
+        self.update_grid()
+
+    def evolve_occupied(self, occupied: np.ndarray) -> np.ndarray:
+        counts = self.strategy.occupied_counts(occupied)
+        new_occupied = occupied.copy()
+        seats = new_occupied[:-1]
+        # rule for seat to become occupied
+        seats[~occupied[:-1] & (counts <= self.birth_threshold)] = True
+        # rule for seat to become vacant
+        seats[occupied[:-1] & (counts >= self.death_threshold)] = False
+        return new_occupied
+
+    def evolve_grid(self) -> np.ndarray:
+        return self.to_grid(self.evolve_occupied(self.occupied))
+
+    def update_grid(self):
+        self.grid = self.to_grid(self.occupied)
+
+    def to_grid(self, occupied: np.ndarray) -> np.ndarray:
+        grid = self.grid.copy()
+        grid[self.compiled.seat_rows, self.compiled.seat_cols] = np.where(
+            occupied[:-1], "#", "L"
+        )
+        return grid
+
+    def occupied_neighbour_count(self, i: int, j: int) -> int:
+        """
+        Occupied neighbours of any in-bounds cell, floor cells included.
+
+        Seats read the compiled structure; floor cells are not compiled, so
+        their neighbourhood is walked over the current grid on demand.
+        """
+        if not ((self.xmin <= i <= self.xmax) and (self.ymin <= j <= self.ymax)):
+            raise ValueError(f"Invalid starting index tuple ({i}, {j})")
+        seat = np.nonzero(
+            (self.compiled.seat_rows == i) & (self.compiled.seat_cols == j)
+        )[0]
+        if len(seat) > 0:
+            return int(self.occupied[self.compiled.neighbours[seat[0]]].sum())
+        occupied_count = 0
+        for di, dj in self.neighbourhood.directions:
+            i_current, j_current, steps = i + di, j + dj, 1
+            while (self.xmin <= i_current <= self.xmax) and (
+                self.ymin <= j_current <= self.ymax
+            ):
+                if self.neighbourhood.max_distance is not None and (
+                    steps > self.neighbourhood.max_distance
+                ):
+                    break
+                if self.grid[i_current, j_current] != ".":
+                    occupied_count += int(self.grid[i_current, j_current] == "#")
+                    break
+                i_current, j_current, steps = i_current + di, j_current + dj, steps + 1
+        return occupied_count
+
+    def count_occupied(self) -> int:
+        return int(np.count_nonzero(self.occupied[:-1]))
+
+    def to_string(self) -> str:
+        return "\n".join(["".join(row) for row in self.grid])
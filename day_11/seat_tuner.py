@@ -0,0 +1,250 @@
+import json
+import logging
+import math
+import os
+import platform
+import numpy as np
+from time import perf_counter
+from typing import Dict, NamedTuple, Optional
+
+from seat_rules import STRATEGIES, ChunkedGatherStrategy, CompiledNeighbourhood
+
+
+logger = logging.getLogger(__name__)
+
+# heuristic thresholds, from timing each strategy across layout shapes
+SMALL_LAYOUT_CELLS = 1000
+STENCIL_MIN_SEAT_DENSITY = 0.5
+BINCOUNT_MIN_PADDING_WASTE = 0.5
+CHUNKED_MIN_GATHER_ELEMENTS = 2 ** 22
+CHUNK_ELEMENTS = 2 ** 18
+# neighbour slots per chunk tried when calibrating chunked_gather
+CALIBRATION_CHUNK_ELEMENTS = [2 ** 14, 2 ** 16, 2 ** 18, 2 ** 20]
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "advent_of_code_2020", "seat_tuner.json"
+)
+
+
+class StrategyChoice(NamedTuple):
+    strategy: str
+    chunk_size: Optional[int]
+    reason: str
+
+
+class LayoutProfile:
+    """
+    Shape and density figures of a compiled layout that drive strategy choice.
+    """
+
+    def __init__(self, compiled: CompiledNeighbourhood):
+        rows, cols = compiled.shape
+        self.rows = rows
+        self.cols = cols
+        self.cells = rows * cols
+        self.seat_count = compiled.seat_count
+        self.seat_density = self.seat_count / self.cells if self.cells else 0.0
+        self.width = compiled.width
+        self.mean_neighbours = (
+            float(compiled.neighbour_counts.mean()) if self.seat_count else 0.0
+        )
+        # share of the padded neighbour matrix spent on the vacant sentinel
+        self.padding_waste = (
+            1 - self.mean_neighbours / self.width if self.width else 0.0
+        )
+        self.offsets_only = compiled.neighbourhood.max_distance == 1
+
+    @property
+    def gather_elements(self) -> int:
+        return self.seat_count * self.width
+
+    def cache_key(self) -> str:
+        # bucket layouts so similar ones share a calibration result
+        return "|".join(
+            [
+                "offsets" if self.offsets_only else "rays",
+                f"cells~2^{round(math.log2(self.cells)) if self.cells else 0}",
+                f"density~{round(self.seat_density, 1)}",
+                f"width={self.width}",
+            ]
+        )
+
+    def to_dict(self) -> Dict:
+        return dict(vars(self))
+
+
+def default_chunk_size(profile: LayoutProfile) -> int:
+    return chunk_size_for(profile, CHUNK_ELEMENTS)
+
+
+def chunk_size_for(profile: LayoutProfile, chunk_elements: int) -> int:
+    return max(1024, chunk_elements // max(profile.width, 1))
+
+
+def heuristic_choice(profile: LayoutProfile) -> StrategyChoice:
+    """
+    Choose from shape, seat density and neighbour slot usage.
+
+    Ray lengths are deliberately ignored: rays are resolved once at compile
+    time, so per-round cost does not depend on them. Long rays only matter
+    once they run off the grid and leave slots empty, which `padding_waste`
+    already measures.
+    """
+    if (
+        profile.offsets_only
+        and profile.cells > SMALL_LAYOUT_CELLS
+        and profile.seat_density >= STENCIL_MIN_SEAT_DENSITY
+    ):
+        return StrategyChoice(
+            "stencil",
+            None,
+            f"fixed offsets and seat density {profile.seat_density:.2f} favour "
+            f"contiguous shifted sums over the {profile.rows}x{profile.cols} grid",
+        )
+    if profile.padding_waste >= BINCOUNT_MIN_PADDING_WASTE:
+        return StrategyChoice(
+            "bincount",
+            None,
+            f"{profile.padding_waste:.0%} of the neighbour matrix is padding, "
+            f"so count over edges",
+        )
+    if profile.gather_elements >= CHUNKED_MIN_GATHER_ELEMENTS:
+        return StrategyChoice(
+            ChunkedGatherStrategy.name,
+            default_chunk_size(profile),
+            f"{profile.gather_elements} neighbour slots would need large temporary "
+            f"arrays, so gather in chunks",
+        )
+    return StrategyChoice(
+        "gather",
+        None,
+        f"{profile.seat_count} seats with {profile.mean_neighbours:.1f} of "
+        f"{profile.width} neighbour slots used suit a single gather",
+    )
+
+
+def time_strategy(
+    compiled: CompiledNeighbourhood,
+    strategy: str,
+    chunk_size: Optional[int],
+    trial_rounds: int,
+) -> float:
+    counter = STRATEGIES[strategy](compiled, chunk_size)
+    rng = np.random.default_rng(0)
+    occupied = rng.random(compiled.seat_count + 1) < 0.5
+    occupied[-1] = False
+    # first call warms caches and is not counted
+    counter.occupied_counts(occupied)
+    start_time = perf_counter()
+    for _ in range(trial_rounds):
+        counter.occupied_counts(occupied)
+    return (perf_counter() - start_time) / trial_rounds
+
+
+def calibrated_choice(
+    compiled: CompiledNeighbourhood, profile: LayoutProfile, trial_rounds: int = 3
+) -> StrategyChoice:
+    timings = {
+        name: time_strategy(compiled, name, None, trial_rounds)
+        for name, strategy in STRATEGIES.items()
+        if strategy.applicable(compiled) and name != ChunkedGatherStrategy.name
+    }
+    # chunk sizes under one seat count collapse to the same single chunk
+    chunk_sizes = sorted(
+        {
+            min(chunk_size_for(profile, elements), max(profile.seat_count, 1))
+            for elements in CALIBRATION_CHUNK_ELEMENTS
+        }
+    )
+    chunk_timings = {
+        chunk_size: time_strategy(
+            compiled, ChunkedGatherStrategy.name, chunk_size, trial_rounds
+        )
+        for chunk_size in chunk_sizes
+    }
+    best_chunk_size = min(chunk_timings, key=chunk_timings.get)
+    timings[ChunkedGatherStrategy.name] = chunk_timings[best_chunk_size]
+    fastest = min(timings, key=timings.get)
+    summary = ", ".join(
+        f"{name} {seconds * 1e6:.0f}us" for name, seconds in sorted(timings.items())
+    )
+    return StrategyChoice(
+        fastest,
+        best_chunk_size if fastest == ChunkedGatherStrategy.name else None,
+        f"fastest over {trial_rounds} trial rounds ({summary}; "
+        f"chunked_gather best at {best_chunk_size} seats per chunk)",
+    )
+
+
+def machine_key() -> str:
+    return "|".join(
+        [
+            platform.node(),
+            platform.machine(),
+            platform.processor(),
+            platform.python_version(),
+            np.__version__,
+        ]
+    )
+
+
+def load_cache(cache_path: str) -> Dict:
+    try:
+        with open(cache_path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache_path: str, cache: Dict):
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, "w") as f:
+            json.dump(cache, f, indent=2)
+    except OSError as e:
+        logger.warning("Could not write seat tuner cache %s: %s", cache_path, e)
+
+
+def choose_strategy(
+    compiled: CompiledNeighbourhood,
+    calibrate: bool = False,
+    cache_path: Optional[str] = None,
+    trial_rounds: int = 3,
+) -> StrategyChoice:
+    """
+    Pick a counting strategy for a compiled layout.
+
+    By default this is a heuristic on the layout profile. With `calibrate`,
+    applicable strategies are timed on this machine and the winner is cached
+    per machine and layout bucket, so later layouts of that kind skip trials.
+    """
+    profile = LayoutProfile(compiled)
+    if not calibrate:
+        choice = heuristic_choice(profile)
+    else:
+        cache_path = cache_path or os.environ.get(
+            "SEAT_TUNER_CACHE", DEFAULT_CACHE_PATH
+        )
+        cache = load_cache(cache_path)
+        machine_cache = cache.setdefault(machine_key(), {})
+        cached = machine_cache.get(profile.cache_key())
+        if cached and cached.get("strategy") in STRATEGIES:
+            choice = StrategyChoice(
+                cached["strategy"],
+                cached.get("chunk_size"),
+                f"cached calibration: {cached.get('reason')}",
+            )
+        else:
+            choice = calibrated_choice(compiled, profile, trial_rounds)
+            machine_cache[profile.cache_key()] = choice._asdict()
+            save_cache(cache_path, cache)
+    logger.info(
+        "Using %s strategy for %dx%d layout with %d seats: %s",
+        choice.strategy,
+        profile.rows,
+        profile.cols,
+        profile.seat_count,
+        choice.reason,
+    )
+    logger.debug("Layout profile: %s", profile.to_dict())
+    return choice
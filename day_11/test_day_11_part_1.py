@@ -107,3 +107,11 @@ def test_seat_layout__count_occupied(layout_0):
     seat_layout = sut.SeatLayout(layout_0)
     seat_layout.apply_until_convergence()
     assert seat_layout.count_occupied() == 37
+
+
+def test_seat_layout__adjacent_occupied_count(layout_2):
+    seat_layout = sut.SeatLayout(layout_2)
+    # floor cells count their neighbours too
+    assert seat_layout.adjacent_occupied_count(0, 1) == 2
+    assert seat_layout.adjacent_occupied_count(0, 4) == 0
+    assert seat_layout.adjacent_occupied_count(1, 0) == 1
@@ -0,0 +1,119 @@
+import os
+import subprocess
+import sys
+import numpy as np
+import pytest
+import seat_rules as sut
+
+
+VISIBLE_FROM_CENTRE = [(0, 0), (0, 2), (2, 0), (2, 4), (4, 0), (4, 4)]
+
+
+@pytest.fixture
+def layout():
+    return """#.L..
+.....
+L.#.#
+.....
+#...L"""
+
+
+def neighbour_cells(compiled, i, j):
+    seat = np.nonzero((compiled.seat_rows == i) & (compiled.seat_cols == j))[0][0]
+    return sorted(
+        (compiled.seat_rows[s], compiled.seat_cols[s])
+        for s in compiled.neighbours[seat]
+        if s < compiled.seat_count
+    )
+
+
+def compile_layout(layout, neighbourhood):
+    grid = np.array([list(line) for line in layout.split("\n")])
+    return neighbourhood.compile(grid != ".")
+
+
+def test_neighbourhood__adjacent(layout):
+    compiled = compile_layout(layout, sut.Neighbourhood.adjacent())
+    assert neighbour_cells(compiled, 2, 2) == []
+    assert compiled.neighbours.shape[1] == 0
+
+
+def test_neighbourhood__line_of_sight(layout):
+    compiled = compile_layout(layout, sut.Neighbourhood.line_of_sight())
+    assert neighbour_cells(compiled, 2, 2) == VISIBLE_FROM_CENTRE
+
+
+def test_neighbourhood__line_of_sight_max_distance(layout):
+    neighbourhood = sut.Neighbourhood.line_of_sight(max_distance=1)
+    assert neighbour_cells(compile_layout(layout, neighbourhood), 2, 2) == []
+    neighbourhood = sut.Neighbourhood.line_of_sight(max_distance=2)
+    compiled = compile_layout(layout, neighbourhood)
+    assert neighbour_cells(compiled, 2, 2) == VISIBLE_FROM_CENTRE
+
+
+def test_neighbourhood__radius(layout):
+    compiled = compile_layout(layout, sut.Neighbourhood.radius(2))
+    assert neighbour_cells(compiled, 0, 0) == [(0, 2), (2, 0), (2, 2)]
+
+
+def test_neighbourhood__custom_directions(layout):
+    neighbourhood = sut.Neighbourhood.line_of_sight([(0, 1), (1, 0)])
+    compiled = compile_layout(layout, neighbourhood)
+    assert neighbour_cells(compiled, 0, 0) == [(0, 2), (2, 0)]
+
+
+def test_neighbourhood__invalid():
+    with pytest.raises(ValueError):
+        sut.Neighbourhood([(0, 0)])
+    with pytest.raises(ValueError):
+        sut.Neighbourhood(max_distance=0)
+
+
+def test_rule_seat_layout__thresholds(layout):
+    class LonelySeatLayout(sut.RuleSeatLayout):
+        neighbourhood = sut.Neighbourhood.line_of_sight()
+        birth_threshold = 1
+        death_threshold = 2
+
+    seat_layout = LonelySeatLayout(layout)
+    assert seat_layout.occupied_neighbour_count(2, 2) == 3
+    seat_layout.apply_round()
+    assert seat_layout.to_string() == """#.L..
+.....
+L.L.#
+.....
+#...L"""
+
+
+def test_rule_seat_layout__quiet_convergence(layout, capsys):
+    seat_layout = sut.RuleSeatLayout(layout)
+    assert seat_layout.apply_until_convergence(verbose=False) >= 0
+    out, _ = capsys.readouterr()
+    assert out == ""
+
+
+def test_rule_seat_layout__default_strategy_without_tuner(layout):
+    code = (
+        "import sys, seat_rules; "
+        f"layout = seat_rules.RuleSeatLayout({layout!r}); "
+        "print(layout.strategy.name, 'seat_tuner' in sys.modules)"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=os.path.dirname(os.path.abspath(sut.__file__)),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert completed.stdout.split() == ["gather", "False"]
+
+
+def test_rule_seat_layout__strategy_selector(layout):
+    class Choice:
+        strategy = "bincount"
+        chunk_size = None
+
+    class SelectedSeatLayout(sut.RuleSeatLayout):
+        strategy_selector = staticmethod(lambda compiled, calibrate: Choice)
+
+    assert SelectedSeatLayout(layout).strategy.name == "bincount"
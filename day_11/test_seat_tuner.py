@@ -0,0 +1,132 @@
+import json
+import logging
+import random
+import numpy as np
+import pytest
+import seat_rules
+import seat_tuner as sut
+import day_11_part_1
+import day_11_part_2
+
+
+def random_layout(rows, cols, seat_density, seed=0):
+    rng = random.Random(seed)
+    return "\n".join(
+        "".join("L" if rng.random() < seat_density else "." for _ in range(cols))
+        for _ in range(rows)
+    )
+
+
+def compile_layout(layout, neighbourhood):
+    grid = np.array([list(line) for line in layout.split("\n")])
+    return neighbourhood.compile(grid != ".")
+
+
+@pytest.mark.parametrize(
+    "rows, cols, seat_density, neighbourhood, expected",
+    [
+        (10, 10, 0.8, seat_rules.Neighbourhood.adjacent(), "gather"),
+        (100, 100, 0.8, seat_rules.Neighbourhood.adjacent(), "stencil"),
+        (100, 100, 0.05, seat_rules.Neighbourhood.adjacent(), "bincount"),
+        (100, 100, 0.8, seat_rules.Neighbourhood.line_of_sight(), "gather"),
+        (100, 100, 0.05, seat_rules.Neighbourhood.line_of_sight(), "gather"),
+    ],
+)
+def test_heuristic_choice(rows, cols, seat_density, neighbourhood, expected):
+    compiled = compile_layout(random_layout(rows, cols, seat_density), neighbourhood)
+    profile = sut.LayoutProfile(compiled)
+    assert sut.heuristic_choice(profile).strategy == expected
+
+
+def test_heuristic_choice__chunked(monkeypatch):
+    monkeypatch.setattr(sut, "CHUNKED_MIN_GATHER_ELEMENTS", 1000)
+    layout = random_layout(30, 30, 0.9)
+    compiled = compile_layout(layout, seat_rules.Neighbourhood.line_of_sight())
+    choice = sut.heuristic_choice(sut.LayoutProfile(compiled))
+    assert choice.strategy == "chunked_gather"
+    assert choice.chunk_size > 0
+
+
+@pytest.mark.parametrize(
+    "seat_layout_class, strategy",
+    [(day_11_part_1.SeatLayout, strategy) for strategy in sorted(seat_rules.STRATEGIES)]
+    + [
+        (day_11_part_2.SeatLayout, strategy)
+        for strategy in ["bincount", "chunked_gather", "gather"]
+    ],
+)
+@pytest.mark.parametrize("seat_density", [0.2, 0.6])
+def test_strategies_agree(seat_layout_class, strategy, seat_density):
+    layout = random_layout(40, 30, seat_density, seed=3)
+    expected = seat_layout_class(layout, strategy="gather")
+    seat_layout = seat_layout_class(layout, strategy=strategy, chunk_size=50)
+    for _ in range(5):
+        expected.apply_round()
+        seat_layout.apply_round()
+        assert seat_layout.to_string() == expected.to_string()
+
+
+@pytest.mark.parametrize("strategy", ["bincount", "chunked_gather", "gather"])
+def test_strategies_agree__line_of_sight_example(strategy):
+    layout = """L.LL.LL.LL
+LLLLLLL.LL
+L.L.L..L..
+LLLL.LL.LL
+L.LL.LL.LL
+L.LLLLL.LL
+..L.L.....
+LLLLLLLLLL
+L.LLLLLL.L
+L.LLLLL.LL"""
+    seat_layout = day_11_part_2.SeatLayout(layout, strategy=strategy, chunk_size=7)
+    assert seat_layout.apply_until_convergence(verbose=False) == 6
+    assert seat_layout.count_occupied() == 26
+
+
+def test_stencil_requires_fixed_offsets():
+    with pytest.raises(ValueError):
+        day_11_part_2.SeatLayout(random_layout(5, 5, 0.5), strategy="stencil")
+
+
+def test_choose_strategy__calibrates_and_caches(tmp_path, caplog):
+    cache_path = str(tmp_path / "seat_tuner.json")
+    compiled = compile_layout(
+        random_layout(20, 20, 0.7), seat_rules.Neighbourhood.adjacent()
+    )
+    with caplog.at_level(logging.DEBUG, logger="seat_tuner"):
+        choice = sut.choose_strategy(compiled, calibrate=True, cache_path=cache_path)
+    assert choice.strategy in seat_rules.STRATEGIES
+    assert "trial rounds" in choice.reason
+    assert f"Using {choice.strategy} strategy" in caplog.text
+    assert "'padding_waste':" in caplog.text
+    with open(cache_path, "r") as f:
+        cache = json.load(f)
+    assert cache[sut.machine_key()]
+    cached_choice = sut.choose_strategy(
+        compiled, calibrate=True, cache_path=cache_path
+    )
+    assert cached_choice.strategy == choice.strategy
+    assert cached_choice.reason.startswith("cached calibration")
+
+
+def test_calibrated_choice__tunes_chunk_size(monkeypatch):
+    compiled = compile_layout(
+        random_layout(60, 60, 0.7), seat_rules.Neighbourhood.line_of_sight()
+    )
+    profile = sut.LayoutProfile(compiled)
+    timed = []
+
+    def fake_time_strategy(compiled, strategy, chunk_size, trial_rounds):
+        timed.append((strategy, chunk_size))
+        # make chunked_gather fastest at its largest chunk size
+        if strategy == "chunked_gather":
+            return 1.0 / chunk_size
+        return 1.0
+
+    monkeypatch.setattr(sut, "CALIBRATION_CHUNK_ELEMENTS", [8192, 16384])
+    monkeypatch.setattr(sut, "time_strategy", fake_time_strategy)
+    choice = sut.calibrated_choice(compiled, profile)
+    chunk_sizes = [size for strategy, size in timed if strategy == "chunked_gather"]
+    assert chunk_sizes == [1024, 2048]
+    assert (choice.strategy, choice.chunk_size) == ("chunked_gather", 2048)
+    assert "2048 seats per chunk" in choice.reason
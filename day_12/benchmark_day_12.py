@@ -0,0 +1,403 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import tracemalloc
+from time import perf_counter
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import day_12_part_1
+import day_12_part_2
+
+
+NAVIGATORS = {1: day_12_part_1.ShipNavigator, 2: day_12_part_2.ShipNavigator}
+
+DEFAULT_ACTION_WEIGHTS: Dict[str, float] = {
+    "N": 1,
+    "S": 1,
+    "E": 1,
+    "W": 1,
+    "L": 1,
+    "R": 1,
+    "F": 4,
+}
+DEFAULT_MOVE_RANGE: Tuple[int, int] = (1, 100)
+DEFAULT_TURN_VALUES: Tuple[int, ...] = (90, 180, 270)
+DEFAULT_SIZES: Tuple[int, ...] = (10 ** 3, 10 ** 4, 10 ** 5)
+DEFAULT_CHUNK_SIZE = 10 ** 6
+DEFAULT_CHECKPOINT_INTERVAL = 10 ** 3
+
+# unit vectors for headings/waypoint rotations in exact integer arithmetic
+EXACT_HEADINGS = {0: (1, 0), 90: (0, 1), 180: (-1, 0), 270: (0, -1)}
+
+
+def generate_instruction_chunks(
+    length: int,
+    seed: int = 0,
+    action_weights: Optional[Dict[str, float]] = None,
+    move_range: Tuple[int, int] = DEFAULT_MOVE_RANGE,
+    turn_values: Sequence[int] = DEFAULT_TURN_VALUES,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[str]:
+    """
+    Yield newline separated instruction strings totalling `length` instructions.
+
+    Output is fully determined by the arguments, so a given seed and chunk size
+    always reproduces the same instruction stream.
+    """
+    if length < 1:
+        raise ValueError(f"Invalid instruction count: {length}")
+    action_weights = action_weights or DEFAULT_ACTION_WEIGHTS
+    invalid_actions = set(action_weights) - set(DEFAULT_ACTION_WEIGHTS)
+    if invalid_actions:
+        raise ValueError(f"Invalid actions: {sorted(invalid_actions)}")
+    actions = list(action_weights)
+    weights = [action_weights[action] for action in actions]
+    move_min, move_max = move_range
+    if move_min > move_max:
+        raise ValueError(f"Invalid move range: {move_range}")
+    turn_values = list(turn_values)
+    if not turn_values:
+        raise ValueError("No turn values given")
+    if chunk_size < 1:
+        raise ValueError(f"Invalid chunk size: {chunk_size}")
+    rng = random.Random(seed)
+    remaining = length
+    while remaining > 0:
+        count = min(chunk_size, remaining)
+        remaining -= count
+        chunk_actions = rng.choices(actions, weights, k=count)
+        yield "\n".join(
+            action
+            + str(
+                rng.choice(turn_values)
+                if action in "LR"
+                else rng.randint(move_min, move_max)
+            )
+            for action in chunk_actions
+        )
+
+
+def generate_instructions(length: int, seed: int = 0, **kwargs) -> str:
+    return "\n".join(generate_instruction_chunks(length, seed, **kwargs))
+
+
+class ExactNavigator:
+    """
+    Integer reference for both parts, valid while turns are multiples of 90.
+    """
+
+    def __init__(self, part: int):
+        if part not in NAVIGATORS:
+            raise ValueError(f"Invalid part: {part}")
+        self.part = part
+        self.x = 0
+        self.y = 0
+        self.heading = 0
+        self.waypoint_x = 10
+        self.waypoint_y = 1
+
+    def apply_action(self, action: str, value: float):
+        if value != int(value):
+            raise ValueError(f"Non-integer value: {value}")
+        value = int(value)
+        if action in "LR":
+            if value % 90 != 0:
+                raise ValueError(f"Turn is not a multiple of 90 degrees: {value}")
+            self.rotate(value if action == "L" else -value)
+        elif action == "F":
+            if self.part == 1:
+                dx, dy = EXACT_HEADINGS[self.heading]
+            else:
+                dx, dy = self.waypoint_x, self.waypoint_y
+            self.x += value * dx
+            self.y += value * dy
+        elif action in "NSEW":
+            dx, dy = EXACT_HEADINGS[{"E": 0, "N": 90, "W": 180, "S": 270}[action]]
+            if self.part == 1:
+                self.x += value * dx
+                self.y += value * dy
+            else:
+                self.waypoint_x += value * dx
+                self.waypoint_y += value * dy
+        else:
+            raise ValueError(f"Invalid action: {action}")
+
+    def rotate(self, value: int):
+        if self.part == 1:
+            self.heading = (self.heading + value) % 360
+            return
+        cos, sin = EXACT_HEADINGS[value % 360]
+        self.waypoint_x, self.waypoint_y = (
+            cos * self.waypoint_x - sin * self.waypoint_y,
+            sin * self.waypoint_x + cos * self.waypoint_y,
+        )
+
+    def manhattan_distance(self) -> int:
+        return abs(self.x) + abs(self.y)
+
+
+def position_error(navigator, reference: ExactNavigator) -> float:
+    return max(abs(navigator.x - reference.x), abs(navigator.y - reference.y))
+
+
+def has_exact_reference(turn_values: Sequence[int]) -> bool:
+    return all(value % 90 == 0 for value in turn_values)
+
+
+def check_parts(parts: Sequence[int]):
+    invalid_parts = sorted(set(parts) - set(NAVIGATORS))
+    if invalid_parts:
+        raise ValueError(f"Invalid parts: {invalid_parts}")
+
+
+def run_benchmark(
+    part: int,
+    length: int,
+    seed: int = 0,
+    measure_memory: bool = True,
+    checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL,
+    **generator_kwargs,
+) -> Dict:
+    """
+    Time parsing and execution of `length` generated instructions for one part.
+
+    Chunks are parsed and executed independently, so memory is bounded by the
+    largest chunk: each chunk is replayed once under tracemalloc, outside the
+    timed pass, and `max_chunk_peak_memory_bytes` is the highest of those
+    peaks across all `memory_chunks` chunks. Drift against the exact reference
+    is checked every `checkpoint_interval` instructions; only execution between
+    checkpoints is timed.
+    Errors against the exact reference are None when some turn values are not
+    multiples of 90, as no exact reference exists for those.
+    """
+    check_parts([part])
+    if checkpoint_interval < 1:
+        raise ValueError(f"Invalid checkpoint interval: {checkpoint_interval}")
+    navigator = NAVIGATORS[part]("")
+    turn_values = generator_kwargs.get("turn_values", DEFAULT_TURN_VALUES)
+    reference = ExactNavigator(part) if has_exact_reference(turn_values) else None
+    parse_seconds = 0.0
+    execute_seconds = 0.0
+    max_abs_error = 0.0
+    chunk_peaks = []
+    for chunk in generate_instruction_chunks(length, seed, **generator_kwargs):
+        start_time = perf_counter()
+        parsed = [navigator.parse_instruction(line) for line in chunk.split("\n")]
+        parse_seconds += perf_counter() - start_time
+        for start in range(0, len(parsed), checkpoint_interval):
+            segment = parsed[start : start + checkpoint_interval]
+            start_time = perf_counter()
+            for action, value in segment:
+                navigator.apply_action(action, value)
+            execute_seconds += perf_counter() - start_time
+            if reference is None:
+                continue
+            for action, value in segment:
+                reference.apply_action(action, value)
+            max_abs_error = max(max_abs_error, position_error(navigator, reference))
+        if measure_memory:
+            chunk_peaks.append(measure_chunk_peak_memory(part, chunk))
+    total_seconds = parse_seconds + execute_seconds
+    return {
+        "part": part,
+        "instructions": length,
+        "parse_seconds": parse_seconds,
+        "execute_seconds": execute_seconds,
+        "instructions_per_second": length / total_seconds if total_seconds else None,
+        "execute_instructions_per_second": (
+            length / execute_seconds if execute_seconds else None
+        ),
+        "max_chunk_peak_memory_bytes": max(chunk_peaks) if chunk_peaks else None,
+        "memory_chunks": len(chunk_peaks),
+        "manhattan_distance": float(navigator.manhattan_distance()),
+        **exact_errors(navigator, reference, max_abs_error),
+    }
+
+
+def exact_errors(navigator, reference: Optional[ExactNavigator], max_abs_error):
+    if reference is None:
+        return {
+            "final_abs_error": None,
+            "max_abs_error": None,
+            "exact_manhattan_distance": None,
+            "manhattan_error": None,
+        }
+    return {
+        "final_abs_error": float(position_error(navigator, reference)),
+        "max_abs_error": float(max_abs_error),
+        "exact_manhattan_distance": reference.manhattan_distance(),
+        "manhattan_error": float(
+            abs(navigator.manhattan_distance() - reference.manhattan_distance())
+        ),
+    }
+
+
+def measure_chunk_peak_memory(part: int, chunk: str) -> int:
+    navigator = NAVIGATORS[part]("")
+    tracemalloc.start()
+    try:
+        parsed = [navigator.parse_instruction(line) for line in chunk.split("\n")]
+        for action, value in parsed:
+            navigator.apply_action(action, value)
+        _, chunk_peak_memory_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return chunk_peak_memory_bytes
+
+
+def run_suite(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    parts: Sequence[int] = (1, 2),
+    seed: int = 0,
+    measure_memory: bool = True,
+    action_weights: Optional[Dict[str, float]] = None,
+    move_range: Tuple[int, int] = DEFAULT_MOVE_RANGE,
+    turn_values: Sequence[int] = DEFAULT_TURN_VALUES,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL,
+) -> Dict:
+    check_parts(parts)
+    generator_kwargs = {
+        "action_weights": dict(action_weights or DEFAULT_ACTION_WEIGHTS),
+        "move_range": list(move_range),
+        "turn_values": list(turn_values),
+        "chunk_size": chunk_size,
+    }
+    results: List[Dict] = [
+        run_benchmark(
+            part, size, seed, measure_memory, checkpoint_interval, **generator_kwargs
+        )
+        for size in sizes
+        for part in parts
+    ]
+    return {
+        "config": {
+            "seed": seed,
+            "sizes": list(sizes),
+            "checkpoint_interval": checkpoint_interval,
+            **generator_kwargs,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def compare_to_baseline(suite: Dict, baseline: Dict) -> List[Dict]:
+    """
+    Match results on (part, instructions) and report timing ratios to baseline.
+    """
+    if suite["config"] != baseline["config"]:
+        print("Warning: benchmark config differs from baseline", file=sys.stderr)
+    baseline_results = {
+        (result["part"], result["instructions"]): result
+        for result in baseline["results"]
+    }
+    comparisons = []
+    for result in suite["results"]:
+        key = (result["part"], result["instructions"])
+        if key not in baseline_results:
+            continue
+        previous = baseline_results[key]
+        comparisons.append(
+            {
+                "part": result["part"],
+                "instructions": result["instructions"],
+                "parse_ratio": result["parse_seconds"] / previous["parse_seconds"],
+                "execute_ratio": result["execute_seconds"]
+                / previous["execute_seconds"],
+            }
+        )
+    return comparisons
+
+
+def parse_action_weights(weights_string: str) -> Dict[str, float]:
+    # e.g. "F=4,N=1,S=1,E=1,W=1,L=1,R=1"
+    weights = {}
+    for item in weights_string.split(","):
+        action, weight = item.split("=")
+        weights[action.strip()] = float(weight)
+    return weights
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="Instruction counts to benchmark, e.g. 1000 100000000.",
+    )
+    parser.add_argument(
+        "--parts", type=int, nargs="+", choices=sorted(NAVIGATORS), default=[1, 2]
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--weights",
+        type=parse_action_weights,
+        default=None,
+        help="Action mix, e.g. F=4,N=1,S=1,E=1,W=1,L=1,R=1.",
+    )
+    parser.add_argument("--move-min", type=int, default=DEFAULT_MOVE_RANGE[0])
+    parser.add_argument("--move-max", type=int, default=DEFAULT_MOVE_RANGE[1])
+    parser.add_argument(
+        "--turn-values", type=int, nargs="+", default=list(DEFAULT_TURN_VALUES)
+    )
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument(
+        "--checkpoint-interval",
+        type=int,
+        default=DEFAULT_CHECKPOINT_INTERVAL,
+        help="Instructions between drift checks against the exact reference.",
+    )
+    parser.add_argument("--no-memory", action="store_true")
+    parser.add_argument("--output", type=str, help="Path to write JSON results.")
+    parser.add_argument(
+        "--baseline", type=str, help="Path to JSON results to compare against."
+    )
+    args = parser.parse_args()
+    try:
+        suite = run_suite(
+            sizes=args.sizes,
+            parts=args.parts,
+            seed=args.seed,
+            measure_memory=not args.no_memory,
+            action_weights=args.weights,
+            move_range=(args.move_min, args.move_max),
+            turn_values=args.turn_values,
+            chunk_size=args.chunk_size,
+            checkpoint_interval=args.checkpoint_interval,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    for result in suite["results"]:
+        max_abs_error = result["max_abs_error"]
+        error_string = "n/a" if max_abs_error is None else f"{max_abs_error:.3g}"
+        print(
+            f"part {result['part']} n={result['instructions']}: "
+            f"parse {result['parse_seconds']:.3f}s, "
+            f"execute {result['execute_seconds']:.3f}s, "
+            f"{result['instructions_per_second']:.0f} instructions/s, "
+            f"max chunk peak memory {result['max_chunk_peak_memory_bytes']} bytes "
+            f"over {result['memory_chunks']} chunks, "
+            f"max error {error_string}"
+        )
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        for comparison in compare_to_baseline(suite, baseline):
+            print(
+                f"part {comparison['part']} n={comparison['instructions']}: "
+                f"parse x{comparison['parse_ratio']:.2f}, "
+                f"execute x{comparison['execute_ratio']:.2f} vs baseline"
+            )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(suite, f, indent=2)
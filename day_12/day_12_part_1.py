@@ -1,5 +1,6 @@
 import argparse
-import numpy as np
+import math
+from typing import Tuple
 
 
 class ShipNavigator:
@@ -16,8 +17,14 @@ class ShipNavigator:
             self.apply_instruction(instruction)
 
     def apply_instruction(self, instruction: str):
-        action = instruction[0]
-        value = float(instruction[1:])
+        action, value = self.parse_instruction(instruction)
+        self.apply_action(action, value)
+
+    @staticmethod
+    def parse_instruction(instruction: str) -> Tuple[str, float]:
+        return instruction[0], float(instruction[1:])
+
+    def apply_action(self, action: str, value: float):
         if action == "N":
             self.y += value
         elif action == "S":
@@ -73,13 +80,13 @@ class ShipNavigator:
             y_sign = -1
         else:
             raise ValueError(f"Invalid heading: {self.heading}")
-        reduced_heading_radians = (np.pi / 180) * reduced_heading
-        x_increment = x_sign * value * np.cos(reduced_heading_radians)
-        y_increment = y_sign * value * np.sin(reduced_heading_radians)
+        reduced_heading_radians = (math.pi / 180) * reduced_heading
+        x_increment = x_sign * value * math.cos(reduced_heading_radians)
+        y_increment = y_sign * value * math.sin(reduced_heading_radians)
         return x_increment, y_increment
 
     def manhattan_distance(self):
-        return np.abs(self.x) + np.abs(self.y)
+        return abs(self.x) + abs(self.y)
 
 
 if __name__ == "__main__":
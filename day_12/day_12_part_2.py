@@ -1,8 +1,9 @@
 import argparse
-import numpy as np
+import math
+from typing import Tuple
 
 
-DEGREES_TO_RADIANS = np.pi / 180
+DEGREES_TO_RADIANS = math.pi / 180
 
 
 class ShipNavigator:
@@ -20,8 +21,14 @@ class ShipNavigator:
             self.apply_instruction(instruction)
 
     def apply_instruction(self, instruction: str):
-        action = instruction[0]
-        value = float(instruction[1:])
+        action, value = self.parse_instruction(instruction)
+        self.apply_action(action, value)
+
+    @staticmethod
+    def parse_instruction(instruction: str) -> Tuple[str, float]:
+        return instruction[0], float(instruction[1:])
+
+    def apply_action(self, action: str, value: float):
         if action == "N":
             self.waypoint_y += value
         elif action == "S":
@@ -73,12 +80,12 @@ class ShipNavigator:
         self.waypoint_x = (
             x_sign
             * previous_distance_to_waypoint
-            * np.cos(reduced_angle_to_waypoint_radians)
+            * math.cos(reduced_angle_to_waypoint_radians)
         )
         self.waypoint_y = (
             y_sign
             * previous_distance_to_waypoint
-            * np.sin(reduced_angle_to_waypoint_radians)
+            * math.sin(reduced_angle_to_waypoint_radians)
         )
 
     @property
@@ -107,7 +114,7 @@ class ShipNavigator:
             (
                 radian_constant
                 + arccos_multiple
-                * np.arccos(x_multiple * self.waypoint_x / self.distance_to_waypoint)
+                * math.acos(x_multiple * self.waypoint_x / self.distance_to_waypoint)
             )
             * 1
             / DEGREES_TO_RADIANS
@@ -115,10 +122,10 @@ class ShipNavigator:
 
     @property
     def distance_to_waypoint(self):
-        return np.sqrt(self.waypoint_x ** 2 + self.waypoint_y ** 2)
+        return math.sqrt(self.waypoint_x ** 2 + self.waypoint_y ** 2)
 
     def manhattan_distance(self):
-        return np.abs(self.x) + np.abs(self.y)
+        return abs(self.x) + abs(self.y)
 
 
 if __name__ == "__main__":
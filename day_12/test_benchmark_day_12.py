@@ -0,0 +1,82 @@
+import pytest
+import benchmark_day_12 as sut
+
+
+@pytest.fixture
+def instructions():
+    return """F10
+N3
+F7
+R90
+F11"""
+
+
+def test_generate_instructions__seeded():
+    first = sut.generate_instructions(500, seed=7, chunk_size=100)
+    second = sut.generate_instructions(500, seed=7, chunk_size=100)
+    assert first == second
+    assert len(first.split("\n")) == 500
+    assert first != sut.generate_instructions(500, seed=8, chunk_size=100)
+
+
+def test_generate_instructions__action_mix_and_ranges():
+    instructions = sut.generate_instructions(
+        1000, action_weights={"F": 1, "L": 1}, move_range=(5, 6), turn_values=[90]
+    )
+    for instruction in instructions.split("\n"):
+        assert instruction in {"F5", "F6", "L90"}
+
+
+@pytest.mark.parametrize("part, expected", [(1, (17, -8)), (2, (214, -72))])
+def test_exact_navigator(instructions, part, expected):
+    reference = sut.ExactNavigator(part)
+    for instruction in instructions.split("\n"):
+        reference.apply_action(*sut.NAVIGATORS[part].parse_instruction(instruction))
+    assert (reference.x, reference.y) == expected
+
+
+@pytest.mark.parametrize("part", [1, 2])
+def test_run_benchmark(part):
+    result = sut.run_benchmark(part, 2000, seed=1, chunk_size=500)
+    assert result["instructions"] == 2000
+    assert result["parse_seconds"] > 0
+    assert result["execute_seconds"] > 0
+    assert result["max_chunk_peak_memory_bytes"] > 0
+    assert result["memory_chunks"] == 4
+    assert result["max_abs_error"] < 1e-3
+    assert result["manhattan_error"] < 1e-3
+
+
+def test_compare_to_baseline():
+    suite = sut.run_suite(sizes=[1000], parts=[1], measure_memory=False)
+    comparisons = sut.compare_to_baseline(suite, suite)
+    assert comparisons == [
+        {"part": 1, "instructions": 1000, "parse_ratio": 1.0, "execute_ratio": 1.0}
+    ]
+
+
+def test_run_benchmark__inexact_turns():
+    result = sut.run_benchmark(2, 500, turn_values=[45, 90], measure_memory=False)
+    assert result["execute_seconds"] > 0
+    assert result["max_abs_error"] is None
+    assert result["manhattan_error"] is None
+    assert result["max_chunk_peak_memory_bytes"] is None
+    assert result["memory_chunks"] == 0
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"parts": [3]}, {"move_range": (5, 1)}, {"turn_values": []}],
+)
+def test_run_suite__invalid_config(kwargs):
+    with pytest.raises(ValueError):
+        sut.run_suite(sizes=[10], measure_memory=False, **kwargs)
+
+
+def test_run_benchmark__checkpoints_within_chunk():
+    result = sut.run_benchmark(
+        2, 5000, seed=2, measure_memory=False, checkpoint_interval=10
+    )
+    assert result["max_abs_error"] >= result["final_abs_error"]
+    with pytest.raises(ValueError):
+        sut.run_benchmark(1, 100, measure_memory=False, checkpoint_interval=0)
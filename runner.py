@@ -0,0 +1,140 @@
+import argparse
+import importlib
+import json
+import os
+import statistics
+import sys
+from time import perf_counter
+from typing import Dict, List, TextIO, Tuple
+
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# (day, part) -> (directory, module); modules are only imported on first use
+ENGINES: Dict[Tuple[int, int], Tuple[str, str]] = {
+    (11, 1): ("day_11", "day_11_part_1"),
+    (11, 2): ("day_11", "day_11_part_2"),
+    (12, 1): ("day_12", "day_12_part_1"),
+    (12, 2): ("day_12", "day_12_part_2"),
+}
+
+# errors a malformed input can raise from an engine, reported per request
+SOLVE_ERRORS = (ArithmeticError, KeyError, TypeError, ValueError, IndexError)
+
+import_seconds: Dict[Tuple[int, int], float] = {}
+
+
+def load_engine(day: int, part: int):
+    if (day, part) not in ENGINES:
+        raise ValueError(f"Invalid day and part: {(day, part)}")
+    directory, module_name = ENGINES[(day, part)]
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    # day modules import their siblings by bare name, as in the day's tests
+    day_path = os.path.join(ROOT_DIR, directory)
+    if day_path not in sys.path:
+        sys.path.insert(0, day_path)
+    start_time = perf_counter()
+    module = importlib.import_module(module_name)
+    import_seconds[(day, part)] = perf_counter() - start_time
+    return module
+
+
+def solve(day: int, part: int, input_string: str) -> int:
+    engine = load_engine(day, part)
+    input_string = input_string.strip()
+    if day == 11:
+        seat_layout = engine.SeatLayout(input_string)
+        seat_layout.apply_until_convergence(verbose=False)
+        return int(seat_layout.count_occupied())
+    navigator = engine.ShipNavigator(input_string)
+    navigator.apply_instructions()
+    # trig-based rotations leave float noise on an integer answer
+    return round(navigator.manhattan_distance())
+
+
+def timed_solve(day: int, part: int, input_string: str, repeat: int = 1) -> Dict:
+    """
+    Solve `repeat` times, keeping the first (cold) run separate from the rest.
+    """
+    if repeat < 1:
+        raise ValueError(f"Invalid repeat count: {repeat}")
+    load_engine(day, part)
+    seconds: List[float] = []
+    for _ in range(repeat):
+        start_time = perf_counter()
+        answer = solve(day, part, input_string)
+        seconds.append(perf_counter() - start_time)
+    return {
+        "day": day,
+        "part": part,
+        "answer": answer,
+        "import_seconds": import_seconds.get((day, part), 0.0),
+        "first_run_seconds": seconds[0],
+        "steady_state_seconds": (
+            statistics.median(seconds[1:]) if len(seconds) > 1 else None
+        ),
+        "run_seconds": seconds,
+    }
+
+
+def read_input(input_txt_file: str) -> str:
+    with open(input_txt_file, "r") as f:
+        return f.read()
+
+
+def format_result(result: Dict, as_json: bool) -> str:
+    if as_json:
+        return json.dumps(result)
+    return str(result["answer"])
+
+
+def serve(
+    input_stream: TextIO, output_stream: TextIO, repeat: int = 1, as_json: bool = False
+):
+    """
+    Answer one "DAY PART INPUT_TXT_FILE" request per line from a warm interpreter.
+    """
+    for line in input_stream:
+        if not line.strip():
+            continue
+        try:
+            day, part, input_txt_file = line.split(maxsplit=2)
+            result = timed_solve(
+                int(day), int(part), read_input(input_txt_file.strip()), repeat
+            )
+            result["input"] = input_txt_file.strip()
+            output_stream.write(format_result(result, as_json) + "\n")
+        except SOLVE_ERRORS + (OSError,) as e:
+            error = f"{type(e).__name__}: {e}"
+            if as_json:
+                output_stream.write(json.dumps({"error": error}) + "\n")
+            else:
+                output_stream.write(f"Error: {error}\n")
+        output_stream.flush()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument(
+        "--json", action="store_true", help="Print answers with timings as JSON."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run_parser = subparsers.add_parser("run", help="Solve one or more input files.")
+    run_parser.add_argument("day", type=int)
+    run_parser.add_argument("part", type=int)
+    run_parser.add_argument("input_txt_files", type=str, nargs="+")
+    subparsers.add_parser(
+        "serve", help="Read 'DAY PART INPUT_TXT_FILE' lines from stdin."
+    )
+    args = parser.parse_args()
+    if args.command == "serve":
+        serve(sys.stdin, sys.stdout, args.repeat, args.json)
+    else:
+        for input_txt_file in args.input_txt_files:
+            result = timed_solve(
+                args.day, args.part, read_input(input_txt_file), args.repeat
+            )
+            result["input"] = input_txt_file
+            print(format_result(result, args.json))
@@ -0,0 +1,360 @@
+import argparse
+import asyncio
+import bisect
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from time import perf_counter
+from typing import Dict, List, Optional
+
+import runner
+
+
+# a 64 MiB request line fits a seat layout of roughly 8000x8000 cells
+DEFAULT_MAX_LINE_BYTES = 2 ** 26
+
+# upper bounds in milliseconds; the final bucket catches everything slower
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+
+class LatencyHistogram:
+    def __init__(self, buckets_ms: List[float] = LATENCY_BUCKETS_MS):
+        self.buckets_ms = list(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, seconds: float):
+        milliseconds = seconds * 1000
+        self.counts[bisect.bisect_left(self.buckets_ms, milliseconds)] += 1
+        self.total_ms += milliseconds
+        self.max_ms = max(self.max_ms, milliseconds)
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def to_dict(self) -> Dict:
+        labels = [f"<={bucket}ms" for bucket in self.buckets_ms]
+        labels.append(f">{self.buckets_ms[-1]}ms")
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else None,
+            "max_ms": self.max_ms,
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+def request_error(job: Dict) -> Optional[str]:
+    for key, expected_type in [("day", int), ("part", int), ("input", str)]:
+        value = job.get(key)
+        # bool is an int subclass but never a valid day or part
+        if not isinstance(value, expected_type) or isinstance(value, bool):
+            return f"Invalid request: {key} must be {expected_type.__name__}"
+    return None
+
+
+def solve_job(job: Dict) -> Dict:
+    error = request_error(job)
+    if error:
+        return {"error": error}
+    start_time = perf_counter()
+    try:
+        answer = runner.solve(job["day"], job["part"], job["input"])
+    except runner.SOLVE_ERRORS as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+    return {"answer": answer, "solve_seconds": perf_counter() - start_time}
+
+
+def layout_cell_count(input_string: str) -> int:
+    input_string = input_string.strip()
+    if not input_string:
+        return 0
+    width = input_string.find("\n")
+    if width < 0:
+        return len(input_string)
+    return (input_string.count("\n") + 1) * width
+
+
+def solve_batch(jobs: List[Dict]) -> List[Dict]:
+    results = []
+    for job in jobs:
+        # one failing job must not take the rest of its batch down with it
+        try:
+            results.append(solve_job(job))
+        except Exception as e:
+            results.append({"error": f"{type(e).__name__}: {e}"})
+    return results
+
+
+class SolverService:
+    """
+    Newline-delimited JSON solver server.
+
+    Requests look like {"id": 1, "day": 11, "part": 2, "input": "L.L..."} and
+    {"command": "stats"}. Small jobs are batched into a single thread call;
+    seat layouts with more than `heavy_cell_threshold` cells go to a process
+    pool. The request queue and in-flight executor jobs are both bounded, so a
+    saturated service stops reading from its clients instead of buffering.
+    A request line longer than `max_line_bytes` gets an error response and
+    the connection is closed, as the rest of that line cannot be skipped.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = 1024,
+        batch_size: int = 32,
+        batch_window_seconds: float = 0.002,
+        heavy_cell_threshold: int = 2500,
+        workers: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        max_line_bytes: int = DEFAULT_MAX_LINE_BYTES,
+    ):
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.batch_window_seconds = batch_window_seconds
+        self.heavy_cell_threshold = heavy_cell_threshold
+        self.workers = workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight or 2 * self.workers
+        self.max_line_bytes = max_line_bytes
+        self.queue: Optional[asyncio.Queue] = None
+        self.in_flight: Optional[asyncio.Semaphore] = None
+        self.process_pool: Optional[ProcessPoolExecutor] = None
+        self.thread_pool: Optional[ThreadPoolExecutor] = None
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.dispatcher: Optional[asyncio.Task] = None
+        self.latency = LatencyHistogram()
+        self.queue_wait = LatencyHistogram()
+        self.max_queue_depth = 0
+        self.batch_count = 0
+        self.batched_job_count = 0
+        self.heavy_job_count = 0
+        self.error_count = 0
+
+    async def start(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        unix_socket_path: Optional[str] = None,
+    ):
+        self.queue = asyncio.Queue(self.max_queue_size)
+        self.in_flight = asyncio.Semaphore(self.max_in_flight)
+        self.process_pool = ProcessPoolExecutor(self.workers)
+        self.thread_pool = ThreadPoolExecutor(1)
+        self.dispatcher = asyncio.create_task(self.dispatch())
+        if unix_socket_path:
+            self.server = await asyncio.start_unix_server(
+                self.handle_connection,
+                path=unix_socket_path,
+                limit=self.max_line_bytes,
+            )
+        else:
+            self.server = await asyncio.start_server(
+                self.handle_connection, host, port, limit=self.max_line_bytes
+            )
+
+    @property
+    def address(self):
+        return self.server.sockets[0].getsockname()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.dispatcher is not None:
+            self.dispatcher.cancel()
+            try:
+                await self.dispatcher
+            except asyncio.CancelledError:
+                pass
+        if self.process_pool is not None:
+            self.process_pool.shutdown()
+        if self.thread_pool is not None:
+            self.thread_pool.shutdown()
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        responses = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ConnectionError:
+                    break
+                except ValueError as e:
+                    self.error_count += 1
+                    await self.respond(
+                        writer,
+                        {
+                            "error": f"Request line longer than "
+                            f"{self.max_line_bytes} bytes: {e}"
+                        },
+                    )
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("Request must be a JSON object")
+                except ValueError as e:
+                    self.error_count += 1
+                    await self.respond(writer, {"error": f"Invalid request: {e}"})
+                    continue
+                if request.get("command") == "stats":
+                    await self.respond(
+                        writer, {"id": request.get("id"), **self.stats()}
+                    )
+                    continue
+                future = asyncio.get_running_loop().create_future()
+                # blocks here when the queue is full, pushing back on the client
+                await self.queue.put((request, future, perf_counter()))
+                self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+                response = asyncio.create_task(
+                    self.respond_when_done(writer, request, future)
+                )
+                responses.add(response)
+                response.add_done_callback(responses.discard)
+            if responses:
+                await asyncio.gather(*responses)
+        finally:
+            writer.close()
+
+    async def respond_when_done(
+        self, writer: asyncio.StreamWriter, request: Dict, future: asyncio.Future
+    ):
+        result = await future
+        await self.respond(writer, {"id": request.get("id"), **result})
+
+    async def respond(self, writer: asyncio.StreamWriter, response: Dict):
+        # a client that has gone away just misses its remaining responses
+        if writer.is_closing():
+            return
+        writer.write((json.dumps(response) + "\n").encode())
+        try:
+            await writer.drain()
+        except ConnectionError:
+            writer.close()
+
+    def is_heavy(self, request: Dict) -> bool:
+        # invalid requests are left to solve_job to report
+        if request_error(request) or request["day"] != 11:
+            return False
+        return layout_cell_count(request["input"]) > self.heavy_cell_threshold
+
+    async def dispatch(self):
+        while True:
+            batch = [await self.queue.get()]
+            deadline = perf_counter() + self.batch_window_seconds
+            while len(batch) < self.batch_size:
+                timeout = deadline - perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            light = []
+            for item in batch:
+                request, _, enqueue_time = item
+                self.queue_wait.record(perf_counter() - enqueue_time)
+                if self.is_heavy(request):
+                    await self.submit(self.process_pool, solve_job, [item], single=True)
+                else:
+                    light.append(item)
+            if light:
+                await self.submit(self.thread_pool, solve_batch, light)
+
+    async def submit(self, executor, function, items: List, single: bool = False):
+        await self.in_flight.acquire()
+        requests = [request for request, _, _ in items]
+        if single:
+            self.heavy_job_count += 1
+        else:
+            self.batch_count += 1
+            self.batched_job_count += len(items)
+        executor_future = asyncio.get_running_loop().run_in_executor(
+            executor, function, requests[0] if single else requests
+        )
+
+        def resolve(done: asyncio.Future):
+            self.in_flight.release()
+            try:
+                results = done.result()
+            except Exception as e:
+                results = {"error": f"{type(e).__name__}: {e}"}
+                results = [results] * len(items)
+            else:
+                results = [results] if single else results
+            for (_, future, enqueue_time), result in zip(items, results):
+                latency_seconds = perf_counter() - enqueue_time
+                self.latency.record(latency_seconds)
+                if "error" in result:
+                    self.error_count += 1
+                if not future.done():
+                    future.set_result({**result, "latency_seconds": latency_seconds})
+
+        executor_future.add_done_callback(resolve)
+
+    def stats(self) -> Dict:
+        return {
+            "queue_depth": self.queue.qsize() if self.queue is not None else 0,
+            "max_queue_depth": self.max_queue_depth,
+            "max_queue_size": self.max_queue_size,
+            "batch_count": self.batch_count,
+            "batched_job_count": self.batched_job_count,
+            "heavy_job_count": self.heavy_job_count,
+            "error_count": self.error_count,
+            "latency": self.latency.to_dict(),
+            "queue_wait": self.queue_wait.to_dict(),
+        }
+
+
+async def serve_forever(service: SolverService, **start_kwargs):
+    await service.start(**start_kwargs)
+    print(f"Serving on {service.address}")
+    try:
+        await service.server.serve_forever()
+    finally:
+        await service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--unix-socket", type=str, help="Serve on this Unix socket instead of TCP."
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-queue-size", type=int, default=1024)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--heavy-cell-threshold", type=int, default=2500)
+    parser.add_argument(
+        "--max-line-bytes",
+        type=int,
+        default=DEFAULT_MAX_LINE_BYTES,
+        help="Longest accepted request line.",
+    )
+    args = parser.parse_args()
+    service = SolverService(
+        max_queue_size=args.max_queue_size,
+        batch_size=args.batch_size,
+        heavy_cell_threshold=args.heavy_cell_threshold,
+        workers=args.workers,
+        max_line_bytes=args.max_line_bytes,
+    )
+    try:
+        asyncio.run(
+            serve_forever(
+                service,
+                host=args.host,
+                port=args.port,
+                unix_socket_path=args.unix_socket,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,93 @@
+import io
+import json
+import subprocess
+import sys
+import pytest
+import runner as sut
+
+
+@pytest.fixture
+def layout():
+    return """L.LL.LL.LL
+LLLLLLL.LL
+L.L.L..L..
+LLLL.LL.LL
+L.LL.LL.LL
+L.LLLLL.LL
+..L.L.....
+LLLLLLLLLL
+L.LLLLLL.L
+L.LLLLL.LL
+"""
+
+
+@pytest.fixture
+def instructions():
+    return """F10
+N3
+F7
+R90
+F11
+"""
+
+
+@pytest.mark.parametrize("part, expected", [(1, 37), (2, 26)])
+def test_solve__day_11(layout, part, expected):
+    assert sut.solve(11, part, layout) == expected
+
+
+@pytest.mark.parametrize("part, expected", [(1, 25), (2, 286)])
+def test_solve__day_12(instructions, part, expected):
+    assert sut.solve(12, part, instructions) == expected
+
+
+def test_solve__invalid_day():
+    with pytest.raises(ValueError):
+        sut.solve(13, 1, "")
+
+
+def test_day_12_does_not_import_numpy():
+    code = (
+        "import sys, runner; runner.solve(12, 2, 'F10'); "
+        "print('numpy' in sys.modules)"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=sut.ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert completed.stdout.strip() == "False"
+
+
+def test_timed_solve__repeat(instructions):
+    result = sut.timed_solve(12, 1, instructions, repeat=3)
+    assert result["answer"] == 25
+    assert len(result["run_seconds"]) == 3
+    assert result["steady_state_seconds"] is not None
+
+
+def test_serve(tmp_path, layout, instructions):
+    layout_file = tmp_path / "layout.txt"
+    layout_file.write_text(layout)
+    instructions_file = tmp_path / "instructions.txt"
+    instructions_file.write_text(instructions)
+    bad_file = tmp_path / "bad.txt"
+    bad_file.write_text("F10\n\nF3")
+    requests = io.StringIO(
+        f"11 2 {layout_file}\n12 2 {instructions_file}\n13 1 {instructions_file}\n"
+        f"12 1 {bad_file}\n12 2 {bad_file}\n12 1 {instructions_file}\n"
+    )
+    output = io.StringIO()
+    sut.serve(requests, output, as_json=True)
+    responses = [json.loads(line) for line in output.getvalue().splitlines()]
+    answers = [response.get("answer") for response in responses]
+    assert answers == [26, 286, None, None, None, 25]
+    assert all("error" in response for response in responses[2:5])
+
+
+def test_solve__does_not_write_stdout(layout, capsys):
+    sut.solve(11, 1, layout)
+    out, _ = capsys.readouterr()
+    assert out == ""
@@ -0,0 +1,223 @@
+import asyncio
+import json
+import socket
+import struct
+import pytest
+import solver_service as sut
+
+
+@pytest.fixture
+def layout():
+    return """L.LL.LL.LL
+LLLLLLL.LL
+L.L.L..L..
+LLLL.LL.LL
+L.LL.LL.LL
+L.LLLLL.LL
+..L.L.....
+LLLLLLLLLL
+L.LLLLLL.L
+L.LLLLL.LL"""
+
+
+@pytest.fixture
+def instructions():
+    return """F10
+N3
+F7
+R90
+F11"""
+
+
+async def exchange(service_kwargs, requests, unix_socket_path=None):
+    service = sut.SolverService(workers=2, **service_kwargs)
+    await service.start(unix_socket_path=unix_socket_path)
+    try:
+        if unix_socket_path:
+            reader, writer = await asyncio.open_unix_connection(unix_socket_path)
+        else:
+            reader, writer = await asyncio.open_connection(*service.address)
+        for request in requests:
+            writer.write((json.dumps(request) + "\n").encode())
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in requests]
+        writer.close()
+        return responses, service.stats()
+    finally:
+        await service.close()
+
+
+def test_latency_histogram():
+    histogram = sut.LatencyHistogram([1, 10])
+    for seconds in [0.0005, 0.005, 0.005, 0.5]:
+        histogram.record(seconds)
+    assert histogram.to_dict()["buckets"] == {"<=1ms": 1, "<=10ms": 2, ">10ms": 1}
+    assert histogram.to_dict()["max_ms"] == 500
+
+
+@pytest.mark.parametrize(
+    "job",
+    [
+        {"day": 12, "part": 3, "input": "F10"},
+        {"day": 12, "part": 1, "input": 5},
+        {"day": "12", "part": 1, "input": "F10"},
+        {"day": 12, "part": True, "input": "F10"},
+        {"day": 12, "input": "F10"},
+    ],
+)
+def test_solve_job__error(job):
+    assert "error" in sut.solve_job(job)
+
+
+def test_solve_batch__isolates_errors(monkeypatch, instructions):
+    solve = sut.runner.solve
+
+    def flaky_solve(day, part, input_string):
+        if input_string == "boom":
+            raise RuntimeError("boom")
+        return solve(day, part, input_string)
+
+    monkeypatch.setattr(sut.runner, "solve", flaky_solve)
+    results = sut.solve_batch(
+        [
+            {"day": 12, "part": 1, "input": instructions},
+            {"day": 12, "part": 1, "input": "boom"},
+            {"day": 12, "part": 2, "input": instructions},
+        ]
+    )
+    assert [result.get("answer") for result in results] == [25, None, 286]
+    assert results[1]["error"] == "RuntimeError: boom"
+
+
+def test_solver_service__mixed_batch(instructions):
+    requests = [
+        {"id": i, "day": 12, "part": 1, "input": 5 if i == 2 else instructions}
+        for i in range(5)
+    ]
+    responses, stats = asyncio.run(exchange({"batch_size": 8}, requests))
+    responses = {response["id"]: response for response in responses}
+    assert "error" in responses[2]
+    assert all(responses[i]["answer"] == 25 for i in [0, 1, 3, 4])
+    assert stats["error_count"] == 1
+
+
+def test_solver_service__batches_light_jobs(layout, instructions):
+    requests = [
+        {"id": i, "day": 12, "part": 1 + i % 2, "input": instructions}
+        for i in range(10)
+    ]
+    requests.append({"id": "seats", "day": 11, "part": 2, "input": layout})
+    responses, stats = asyncio.run(exchange({"batch_size": 16}, requests))
+    answers = {response["id"]: response["answer"] for response in responses}
+    assert answers == {**{i: [25, 286][i % 2] for i in range(10)}, "seats": 26}
+    assert stats["heavy_job_count"] == 0
+    assert stats["batched_job_count"] == 11
+    assert stats["batch_count"] < 11
+    assert stats["latency"]["count"] == 11
+
+
+def test_solver_service__heavy_jobs_use_process_pool(layout):
+    requests = [
+        {"id": part, "day": 11, "part": part, "input": layout} for part in (1, 2)
+    ]
+    responses, stats = asyncio.run(exchange({"heavy_cell_threshold": 10}, requests))
+    answers = {response["id"]: response["answer"] for response in responses}
+    assert answers == {1: 37, 2: 26}
+    assert stats["heavy_job_count"] == 2
+
+
+def test_solver_service__errors_and_stats(tmp_path, instructions):
+    requests = [
+        {"id": 1, "day": 13, "part": 1, "input": instructions},
+        {"id": 2, "command": "stats"},
+    ]
+    responses, _ = asyncio.run(
+        exchange({}, requests, unix_socket_path=str(tmp_path / "solver.sock"))
+    )
+    responses = {response["id"]: response for response in responses}
+    assert "error" in responses[1]
+    assert "queue_depth" in responses[2]
+    assert "latency" in responses[2]
+
+
+def test_solver_service__bounded_queue(instructions):
+    requests = [
+        {"id": i, "day": 12, "part": 1, "input": instructions} for i in range(20)
+    ]
+    responses, stats = asyncio.run(
+        exchange({"max_queue_size": 2, "max_in_flight": 1, "batch_size": 2}, requests)
+    )
+    assert sorted(response["id"] for response in responses) == list(range(20))
+    assert stats["max_queue_depth"] <= 2
+
+
+def test_solver_service__long_request_line():
+    # a 300x300 layout is well over asyncio's default 64 KiB line limit
+    large_layout = "\n".join("L" * 300 for _ in range(300))
+    requests = [{"id": 1, "day": 11, "part": 1, "input": large_layout}]
+    responses, stats = asyncio.run(exchange({}, requests))
+    assert responses[0]["answer"] == sut.runner.solve(11, 1, large_layout)
+    responses, stats = asyncio.run(exchange({"max_line_bytes": 1024}, requests))
+    assert "longer than 1024 bytes" in responses[0]["error"]
+    assert stats["error_count"] == 1
+
+
+async def disconnect_with_pending_responses(requests):
+    service = sut.SolverService(workers=2)
+    await service.start()
+    unhandled = []
+    asyncio.get_running_loop().set_exception_handler(
+        lambda loop, context: unhandled.append(context)
+    )
+    try:
+        _, writer = await asyncio.open_connection(*service.address)
+        for request in requests:
+            writer.write((json.dumps(request) + "\n").encode())
+        await writer.drain()
+        # close with a reset so the server's next writes fail
+        writer.get_extra_info("socket").setsockopt(
+            socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0)
+        )
+        writer.close()
+        await asyncio.sleep(0.5)
+        reader, writer = await asyncio.open_connection(*service.address)
+        writer.write(b'{"command": "stats"}\n')
+        await writer.drain()
+        stats = json.loads(await reader.readline())
+        writer.close()
+        return unhandled, stats
+    finally:
+        await service.close()
+
+
+def test_solver_service__client_disconnects(instructions):
+    requests = [
+        {"id": i, "day": 12, "part": 1, "input": instructions} for i in range(50)
+    ]
+    unhandled, stats = asyncio.run(disconnect_with_pending_responses(requests))
+    assert unhandled == []
+    # whatever was read before the reset was still solved
+    assert stats["queue_depth"] == 0
+    assert stats["latency"]["count"] > 0
+
+
+def test_layout_cell_count(layout):
+    assert sut.layout_cell_count(layout) == 100
+    assert sut.layout_cell_count(layout + "\n") == 100
+    assert sut.layout_cell_count("") == 0
+
+
+@pytest.mark.parametrize(
+    "request_, expected",
+    [
+        ({"day": 11, "part": 1, "input": "L" * 10}, False),
+        ({"day": 11, "part": 1, "input": "LLL\nLLL\nLLL\nLLL"}, True),
+        ({"day": 11, "part": 1, "input": "LLL\nLLL\nLLL\n\n\n"}, False),
+        ({"day": 12, "part": 1, "input": "F10\nF10\nF10\nF10"}, False),
+        ({"day": "11", "part": 1, "input": "LLL\nLLL\nLLL\nLLL"}, False),
+        ({"day": 11, "part": 1, "input": 5}, False),
+    ],
+)
+def test_solver_service__is_heavy(request_, expected):
+    service = sut.SolverService(heavy_cell_threshold=10)
+    assert service.is_heavy(request_) == expected